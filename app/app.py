@@ -1,9 +1,11 @@
 from contextlib import asynccontextmanager
+from itertools import count, islice
 
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
 
-from app.core.config import UPLOAD_DIR
+from app.core.config import UPLOAD_DIR, UPLOAD_TMP_DIR
+from app.core.orjson_response import ORJSONResponse
 from app.db.db import create_db_and_tables
 from app.schemas.post import Post, PostCreate, PostUpdate
 from app.routers.files import router as files_router
@@ -13,13 +15,14 @@ async def lifespan(app: FastAPI):
     """
     App startup/shutdown lifecycle.
 
-    Creates required database tables and upload storage directory.
+    Creates required database tables and upload storage directories.
     """
     await create_db_and_tables()
     UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    UPLOAD_TMP_DIR.mkdir(parents=True, exist_ok=True)
     yield
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 app.mount("/uploads", StaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
 
@@ -31,6 +34,8 @@ app.include_router(
 
 # In-memory store for legacy text posts (GET/POST /posts). Replace with DB when ready.
 text_posts: dict[int, dict] = {1: {"title": "First", "content": "Hello"}}
+# Hands out the next post ID in O(1) instead of scanning text_posts.keys() on every create.
+_next_post_id = count(max(text_posts.keys(), default=0) + 1)
 
 # Route: GET /posts
 # - Returns all posts as JSON.
@@ -39,8 +44,9 @@ text_posts: dict[int, dict] = {1: {"title": "First", "content": "Hello"}}
 def get_all_posts(limit: int = None):
     if limit:
         # What does this do?
-        # Converts the dictionary of posts into a list (so we can slice it).
-        # Then, gets only the first 'limit' items from that list.
+        # Walks the dictionary of posts and stops after the first 'limit' items.
+        # islice does this lazily, so we never copy every post into a list just to
+        # throw most of them away.
         #
         # Why do we do this?
         # Sometimes the user only wants to see a few posts, for example, the most recent 3.
@@ -52,7 +58,7 @@ def get_all_posts(limit: int = None):
         #   {"title": "...", "content": "..."},
         #   {"title": "...", "content": "..."}
         # ]
-        return list(text_posts.values())[:limit]
+        return list(islice(text_posts.values(), limit))
     else:
         return text_posts
 
@@ -76,10 +82,10 @@ def create_post(post: PostCreate) -> PostCreate: # -> means the function returns
     # Create a new dictionary for the post using the title and content sent by the client.
     new_post = {"title": post.title, "content": post.content}  # This line makes a new post using the data from the request.
     
-    # Find the highest existing post ID so the new post can have a unique ID. 
-    # max(text_posts.keys()) gets the highest post ID number.
-    # We then add 1, so the new post always gets the next available ID.
-    next_id = max(text_posts.keys(), default=0) + 1
+    # Get a unique ID for the new post from the module-level counter.
+    # next(_next_post_id) returns the next number in the sequence, so IDs never repeat
+    # and we don't have to look at every existing key to find the highest one.
+    next_id = next(_next_post_id)
     text_posts[next_id] = new_post 
     # FastAPI will turn this Python dictionary into JSON automatically.
     return {"message": "Post created successfully", "post": new_post} 
\ No newline at end of file
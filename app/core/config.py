@@ -13,13 +13,28 @@ from pathlib import Path
 # Upload directory can be overridden through environment variable.
 UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "uploads"))
 
+# Private staging directory for in-progress uploads. It is not served, and by
+# default sits next to UPLOAD_DIR so files can be moved in with an atomic
+# rename (it must stay on the same filesystem).
+UPLOAD_TMP_DIR = Path(
+    os.getenv("UPLOAD_TMP_DIR", str(UPLOAD_DIR.with_name(f"{UPLOAD_DIR.name}.tmp")))
+)
+
 # Maximum upload size in bytes (default: 5 MiB).
 MAX_UPLOAD_SIZE_BYTES = int(os.getenv("MAX_UPLOAD_SIZE_BYTES", str(5 * 1024 * 1024)))
 
+# Chunk size used when streaming uploads to disk (default: 64 KiB).
+UPLOAD_CHUNK_SIZE_BYTES = int(os.getenv("UPLOAD_CHUNK_SIZE_BYTES", str(64 * 1024)))
+
 # Allowed MIME types for uploaded files.
-ALLOWED_UPLOAD_CONTENT_TYPES = {
-    "image/jpeg",
-    "image/png",
-    "image/webp",
-}
+ALLOWED_UPLOAD_CONTENT_TYPES = frozenset(
+    {
+        "image/jpeg",
+        "image/png",
+        "image/webp",
+    }
+)
+
+# Human-readable list of allowed types for error messages (built once).
+ALLOWED_UPLOAD_CONTENT_TYPES_STR = ", ".join(sorted(ALLOWED_UPLOAD_CONTENT_TYPES))
 
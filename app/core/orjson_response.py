@@ -0,0 +1,32 @@
+"""
+JSON response class backed by orjson.
+
+orjson serializes datetimes, UUIDs and nested dicts/lists natively, which is
+noticeably faster than the standard library `json` module for list-shaped
+responses such as the feed.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse that renders content with `orjson.dumps`.
+
+    Datetimes are emitted as RFC 3339 strings (UTC as `Z`); unknown types
+    fall back to `str()` instead of raising.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z,
+        )
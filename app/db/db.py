@@ -1,5 +1,6 @@
 import os
 from collections.abc import AsyncGenerator
+from typing import Any
 
 from dotenv import load_dotenv
 
@@ -10,6 +11,7 @@ from dotenv import load_dotenv
 #   - 'AsyncSession': Lets us interact with the database asynchronously (good for FastAPI speed!).
 #   - 'create_async_engine': Creates an async database connection (needed for async operations).
 #   - 'async_sessionmaker': Factory for creating AsyncSession objects.
+from sqlalchemy import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 #   - 'DeclarativeBase': Makes a base class for our database models (all models inherit from this).
@@ -39,10 +41,35 @@ def get_database_url() -> str:
     return url.strip().strip('"').strip("'")
 
 
+def get_engine_options(url: str) -> dict[str, Any]:
+    """
+    Build `create_async_engine` keyword arguments for the given URL.
+
+    For Postgres, pool sizes can be tuned through DB_POOL_SIZE /
+    DB_MAX_OVERFLOW. With the asyncpg driver we also enlarge the
+    prepared-statement caches, so repeated queries (like the feed) skip
+    re-parsing and re-planning on the server. Other backends (e.g. SQLite)
+    keep SQLAlchemy's default pool settings.
+    """
+    parsed = make_url(url)
+    options: dict[str, Any] = {"echo": False}
+    if parsed.get_backend_name() == "postgresql":
+        options["pool_size"] = int(os.getenv("DB_POOL_SIZE", "20"))
+        options["max_overflow"] = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    if parsed.drivername == "postgresql+asyncpg":
+        options["connect_args"] = {
+            # asyncpg's own per-connection statement cache.
+            "statement_cache_size": 1024,
+            # SQLAlchemy's cache of asyncpg prepared statements.
+            "prepared_statement_cache_size": 1024,
+        }
+    return options
+
+
 DATABASE_URL: str = get_database_url()
 
 # Async engine and session factory shared across the app.
-engine = create_async_engine(DATABASE_URL, echo=False)
+engine = create_async_engine(DATABASE_URL, **get_engine_options(DATABASE_URL))
 async_session_maker: async_sessionmaker[AsyncSession] = async_sessionmaker(
     engine, expire_on_commit=False
 )
@@ -64,7 +91,9 @@ async def create_db_and_tables() -> None:
     """
     Create all tables defined on `Base.metadata`.
 
-    Call this once at startup (e.g. FastAPI startup event).
+    Call this once at startup (e.g. FastAPI startup event). Only missing
+    tables are created, together with their indexes; existing tables are
+    never altered, so column or index changes to them must be applied by hand.
     """
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -1,7 +1,4 @@
-import uuid
-from datetime import datetime
-
-from sqlalchemy import Column, String, Text, DateTime
+from sqlalchemy import Column, String, Text, DateTime, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.db.db import Base
@@ -10,9 +7,15 @@ from app.db.db import Base
 class Post(Base):
     __tablename__ = "posts"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # gen_random_uuid() is built into Postgres 13+, the minimum supported version.
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     caption = Column(Text, nullable=True)
     url = Column(String, nullable=False)
     file_type = Column(String, nullable=False)
     file_name = Column(String, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+# Supports the newest-first feed ordering (and keyset pagination on
+# created_at) without sorting the whole table on every page.
+Index("ix_posts_created_at_id_desc", Post.created_at.desc(), Post.id.desc())
@@ -10,20 +10,50 @@ This module applies production-style API patterns:
 
 from __future__ import annotations
 
+import hashlib
 import logging
+from datetime import datetime, timezone
 from pathlib import Path
-from uuid import uuid4
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
-from sqlalchemy import func, select
+import aiofiles
+import aiofiles.os
+import orjson
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    Header,
+    HTTPException,
+    Query,
+    UploadFile,
+    status,
+)
+from fastapi.responses import Response
+from sqlalchemy import (
+    ColumnElement,
+    Text,
+    case,
+    cast,
+    func,
+    literal_column,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import (
     ALLOWED_UPLOAD_CONTENT_TYPES,
+    ALLOWED_UPLOAD_CONTENT_TYPES_STR,
     MAX_UPLOAD_SIZE_BYTES,
+    UPLOAD_CHUNK_SIZE_BYTES,
     UPLOAD_DIR,
+    UPLOAD_TMP_DIR,
 )
+from app.core.orjson_response import ORJSONResponse
 from app.db.db import get_async_session
 from app.db.db_model import Post
 from app.schemas.file import FeedResponse, FilePostOut, UploadResponse
@@ -33,52 +63,78 @@ router = APIRouter()
 
 
 def _ensure_upload_dir() -> None:
-    """Create the upload directory if it does not already exist."""
+    """Create the upload and staging directories if they do not already exist."""
     UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    UPLOAD_TMP_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def _validate_upload_file_type(file: UploadFile) -> str:
     """Validate upload MIME type and return a normalized value."""
     content_type = (file.content_type or "").strip().lower()
     if content_type not in ALLOWED_UPLOAD_CONTENT_TYPES:
-        allowed = ", ".join(sorted(ALLOWED_UPLOAD_CONTENT_TYPES))
         raise HTTPException(
             status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
             detail=(
                 f"Unsupported file type '{content_type or 'unknown'}'. "
-                f"Allowed types: {allowed}"
+                f"Allowed types: {ALLOWED_UPLOAD_CONTENT_TYPES_STR}"
             ),
         )
     return content_type
 
 
-async def _read_file_content(file: UploadFile) -> bytes:
+async def _stream_to_disk(file: UploadFile, path: Path) -> str:
     """
-    Read upload content with an explicit size cap.
+    Stream upload content to `path` in fixed-size chunks with a size cap.
+
+    Only one chunk is held in memory at a time, and the content is hashed
+    as it is written. If streaming fails for any reason (oversized or empty
+    upload, disk error, client disconnect) the partial file is removed before
+    raising, so failed uploads do not accumulate in the staging directory.
 
-    We read at most MAX_UPLOAD_SIZE_BYTES + 1 to detect oversized payloads
-    without reading arbitrarily large files into memory.
+    Returns:
+        str: Hex SHA-256 digest of the written content.
     """
-    content = await file.read(MAX_UPLOAD_SIZE_BYTES + 1)
-    if not content:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Uploaded file is empty.",
-        )
-    if len(content) > MAX_UPLOAD_SIZE_BYTES:
+    total = 0
+    digest = hashlib.sha256()
+    try:
+        async with aiofiles.open(path, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE_BYTES):
+                total += len(chunk)
+                if total > MAX_UPLOAD_SIZE_BYTES:
+                    break
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        # Synchronous on purpose: under cancellation a further await would
+        # be cancelled too and the partial file would be left behind.
+        path.unlink(missing_ok=True)
+        raise
+
+    if total > MAX_UPLOAD_SIZE_BYTES:
+        await aiofiles.os.remove(path)
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=f"File exceeds max allowed size of {MAX_UPLOAD_SIZE_BYTES} bytes.",
         )
-    return content
+    if total == 0:
+        await aiofiles.os.remove(path)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Uploaded file is empty.",
+        )
+    return digest.hexdigest()
+
 
+def _build_storage_name(original_filename: str | None, content_hash: str) -> str:
+    """
+    Create a content-addressed storage filename preserving only a short suffix.
 
-def _build_storage_name(original_filename: str | None) -> str:
-    """Create a safe storage filename preserving only a short suffix."""
+    Identical uploads map to the same name, so they share one file on disk.
+    """
     suffix = Path(original_filename or "").suffix.lower()
     if len(suffix) > 10:
         suffix = ""
-    return f"{uuid4().hex}{suffix}"
+    return f"{content_hash}{suffix}"
 
 
 def _serialize_post(post: Post) -> FilePostOut:
@@ -93,6 +149,53 @@ def _serialize_post(post: Post) -> FilePostOut:
     )
 
 
+async def _fetch_feed_stats(session: AsyncSession) -> tuple[datetime | None, int]:
+    """Return the newest `created_at` and the total number of posts."""
+    latest, total = (
+        await session.execute(select(func.max(Post.created_at), func.count(Post.id)))
+    ).one()
+    return latest, int(total or 0)
+
+
+def _build_feed_etag(
+    latest: datetime | None,
+    total: int,
+    limit: int,
+    offset: int,
+    cursor: datetime | None,
+    cursor_id: UUID | None,
+) -> str:
+    """
+    Build a strong ETag for one feed page.
+
+    Posts are only ever added, so the newest timestamp plus the total count
+    identify the feed state; the page parameters pick the slice of it.
+    """
+    raw = f"{latest}-{total}-{limit}-{offset}-{cursor}-{cursor_id}"
+    return f'"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header value against `etag`."""
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _utc_isoformat(column: ColumnElement[datetime]) -> ColumnElement[str]:
+    """
+    SQL expression rendering a timestamptz like orjson/Pydantic do.
+
+    Produces `YYYY-MM-DDTHH:MM:SS[.ffffff]Z` in UTC, with the fraction only
+    when it is non-zero, so `/feed` and `/upload` emit the same format.
+    """
+    utc = func.timezone("UTC", column)
+    fraction = case(
+        (func.date_trunc("second", utc) == utc, ""),
+        else_=func.to_char(utc, ".US"),
+    )
+    return func.to_char(utc, 'YYYY-MM-DD"T"HH24:MI:SS') + fraction + "Z"
+
+
 @router.post(
     "/upload",
     response_model=UploadResponse,
@@ -110,12 +213,13 @@ async def upload_file(
         UploadResponse: Confirmation message plus the stored post metadata.
     """
     content_type = _validate_upload_file_type(file)
-    content = await _read_file_content(file)
     _ensure_upload_dir()
 
-    stored_name = _build_storage_name(file.filename)
+    tmp_path = UPLOAD_TMP_DIR / f"{uuid4().hex}.part"
+    content_hash = await _stream_to_disk(file, tmp_path)
+
+    stored_name = _build_storage_name(file.filename, content_hash)
     storage_path = UPLOAD_DIR / stored_name
-    storage_path.write_bytes(content)
 
     post = Post(
         caption=caption.strip() or None,
@@ -125,17 +229,47 @@ async def upload_file(
     )
 
     try:
-        session.add(post)
-        await session.commit()
-        await session.refresh(post)
-    except SQLAlchemyError:
-        await session.rollback()
-        logger.exception("Failed to persist uploaded post metadata.")
-        storage_path.unlink(missing_ok=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to save upload metadata.",
-        )
+        try:
+            session.add(post)
+            # The INSERT's RETURNING clause fills in the server-generated id
+            # and created_at, so no refresh is needed after the commit.
+            await session.commit()
+        except SQLAlchemyError:
+            await session.rollback()
+            logger.exception("Failed to persist uploaded post metadata.")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to save upload metadata.",
+            )
+
+        # Publish the file only after its row is committed, so a failed insert
+        # never leaves a file behind. Identical content already on disk is reused.
+        try:
+            if await aiofiles.os.path.exists(storage_path):
+                await aiofiles.os.remove(tmp_path)
+            else:
+                await aiofiles.os.replace(tmp_path, storage_path)
+        except OSError:
+            logger.exception(
+                "Post %s is committed but its file %s could not be published.",
+                post.id,
+                stored_name,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to store uploaded file.",
+            )
+        except BaseException:
+            logger.error(
+                "Post %s is committed but publishing its file %s was interrupted.",
+                post.id,
+                stored_name,
+            )
+            raise
+    except BaseException:
+        # Synchronous for the same reason as in _stream_to_disk.
+        tmp_path.unlink(missing_ok=True)
+        raise
     finally:
         await file.close()
 
@@ -147,26 +281,120 @@ async def upload_file(
 
 @router.get(
     "/feed",
-    response_model=FeedResponse,
+    response_model=None,
     status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {"model": FeedResponse},
+        status.HTTP_304_NOT_MODIFIED: {"description": "Feed page unchanged."},
+    },
 )
 async def get_feed(
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: datetime | None = Query(default=None),
+    cursor_id: UUID | None = Query(default=None),
+    if_none_match: str | None = Header(default=None),
     session: AsyncSession = Depends(get_async_session),
-) -> FeedResponse:
+) -> Response:
     """
     Return a paginated feed of uploaded posts sorted by newest first.
+
+    The page is rendered to JSON inside Postgres (`json_agg`) and spliced
+    into the response as an `orjson.Fragment`, so no ORM objects or Pydantic
+    models are built per row. The schema is still advertised in OpenAPI via
+    `responses`.
+
+    When `cursor` and `cursor_id` are given (the `created_at` and `id` of the
+    last post already seen), the page is fetched with keyset pagination on
+    `(created_at, id)` and `offset` is ignored (echoed back as 0). This stays
+    fast on deep pages, unlike OFFSET. A cursor without a timezone is read
+    as UTC.
+
+    Every response carries an ETag. When the client sends a matching
+    If-None-Match, a bodiless 304 is returned before the page is queried.
     """
+    if (cursor is None) != (cursor_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="cursor and cursor_id must be provided together.",
+        )
+    if cursor is not None:
+        offset = 0
+        if cursor.tzinfo is None:
+            cursor = cursor.replace(tzinfo=timezone.utc)
+
     try:
-        stmt = (
-            select(Post)
-            .order_by(Post.created_at.desc())
+        stats: tuple[datetime | None, int] | None = None
+        if if_none_match is not None:
+            stats = await _fetch_feed_stats(session)
+            etag = _build_feed_etag(*stats, limit, offset, cursor, cursor_id)
+            if _etag_matches(if_none_match, etag):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers={"ETag": etag},
+                )
+
+        columns = [
+            cast(Post.id, Text).label("id"),
+            Post.caption,
+            Post.url,
+            Post.file_type,
+            Post.file_name,
+            Post.created_at,
+        ]
+        if cursor is None:
+            # COUNT(*) OVER () lets Postgres compute the total while streaming
+            # the page, so we avoid a second full-table count round-trip.
+            # Keyset pages skip these: a window aggregate would have to visit
+            # every older row and turn the index seek back into a scan.
+            columns += [
+                func.count().over().label("total"),
+                func.max(Post.created_at).over().label("latest"),
+            ]
+        page = (
+            select(*columns)
+            .order_by(Post.created_at.desc(), Post.id.desc())
             .limit(limit)
-            .offset(offset)
         )
-        posts = (await session.scalars(stmt)).all()
-        total = (await session.scalar(select(func.count(Post.id)))) or 0
+        if cursor is not None:
+            page = page.where(tuple_(Post.created_at, Post.id) < (cursor, cursor_id))
+        else:
+            page = page.offset(offset)
+        page = page.subquery("page")
+
+        post_json = func.json_build_object(
+            "id", page.c.id,
+            "caption", page.c.caption,
+            "url", page.c.url,
+            "file_type", page.c.file_type,
+            "file_name", page.c.file_name,
+            "created_at", _utc_isoformat(page.c.created_at),
+        )
+        aggregates = [
+            cast(
+                func.coalesce(
+                    func.json_agg(
+                        aggregate_order_by(
+                            post_json, page.c.created_at.desc(), page.c.id.desc()
+                        )
+                    ),
+                    literal_column("'[]'::json"),
+                ),
+                Text,
+            ),
+        ]
+        if cursor is None:
+            aggregates += [func.max(page.c.total), func.max(page.c.latest)]
+        row = (await session.execute(select(*aggregates))).one()
+        posts_json = row[0]
+        if stats is None:
+            if cursor is None and row[1] is not None:
+                stats = (row[2], int(row[1]))
+            else:
+                # Keyset page, or an empty offset page carrying no window
+                # values, so read the whole-feed stats directly.
+                stats = await _fetch_feed_stats(session)
+        latest, total = stats
     except SQLAlchemyError:
         logger.exception("Failed to fetch feed.")
         raise HTTPException(
@@ -174,9 +402,16 @@ async def get_feed(
             detail="Failed to fetch feed.",
         )
 
-    return FeedResponse(
-        posts=[_serialize_post(post) for post in posts],
-        limit=limit,
-        offset=offset,
-        total=int(total),
+    return ORJSONResponse(
+        {
+            "posts": orjson.Fragment(posts_json),
+            "limit": limit,
+            "offset": offset,
+            "total": total,
+        },
+        headers={
+            "ETag": _build_feed_etag(
+                latest, total, limit, offset, cursor, cursor_id
+            )
+        },
     )